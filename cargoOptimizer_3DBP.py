@@ -1,6 +1,6 @@
 #########################################################################
 # Description: 3D Bin Packing optimization algorithm: given a set of packages, optimize their transport in a set of vehicles.
-# Dependencies: argparse, csv, collections
+# Dependencies: argparse, bisect, csv, collections, concurrent.futures, itertools, os
 # Usage: transport.py [-h] [--v V] [--p P] [--d] [--l]
 # Optional arguments:
 #     -h, --help    shows help message and exit
@@ -13,9 +13,13 @@
 ##########################################################################
 
 # Dependencies
+from bisect import bisect_left
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import argparse
 import csv
+import os
 
 # Argument Parsing
 def parse_arguments():
@@ -34,6 +38,9 @@ class Package:
     """
     Class representing a package with dimensions and weight.
     """
+    __slots__ = ('__name', '__weight', '__height', '__width', '__thickness', '__volume', '__sortedSize',
+                 '__rotations', '__uniqueRotations', '__currentRotation', '__coordinate', '__maxCoordinate')
+
     def __init__(self, name, w, t, h, weight):
         self.__name = name
         self.__weight = weight
@@ -41,8 +48,13 @@ class Package:
         self.__width = w
         self.__thickness = t
         self.__volume  = w * h * t
+        self.__sortedSize = tuple(sorted((w, t, h))) # dimensions in ascending order, independent of the rotation
+        self.__rotations = ((w, t, h), (w, h, t), (t, h, w), (t, w, h), (h, w, t), (h, t, w)) # sizes [width, thickness, height] of the six rotation types
+        self.__uniqueRotations = tuple((rotation, size) for rotation, size in enumerate(self.__rotations)
+                                       if size not in self.__rotations[:rotation]) # (type, size) of the distinct orientations
         self.__currentRotation = 0
         self.__coordinate = [0, 0, 0] # vertex position (Bottom Rear Left) of the Package in 3D space [width, thickness, height]
+        self.__maxCoordinate = [w, t, h] # opposite vertex (Top Front Right) of the Package in its current rotation
 
     def get_name(self):
         return self.__name
@@ -62,16 +74,18 @@ class Package:
     def get_volume(self):
         return self.__volume
 
+    def get_sorted_size(self):
+        return self.__sortedSize
+
     def get_rotation(self, type):
-        if   type == 0: return [self.__width, self.__thickness, self.__height]
-        elif type == 1: return [self.__width, self.__height, self.__thickness]
-        elif type == 2: return [self.__thickness, self.__height, self.__width]
-        elif type == 3: return [self.__thickness, self.__width, self.__height]
-        elif type == 4: return [self.__height, self.__width, self.__thickness]
-        elif type == 5: return [self.__height, self.__thickness, self.__width]
+        return self.__rotations[type]
+
+    def get_unique_rotations(self):
+        return self.__uniqueRotations
 
     def set_rotation_type(self, type):
         self.__currentRotation = type
+        self.__update_max_coordinate()
 
     def get_rotation_type(self):
         return self.__currentRotation
@@ -81,36 +95,304 @@ class Package:
 
     def set_coordinate(self, coordinate):
         self.__coordinate = coordinate
+        self.__update_max_coordinate()
 
     def get_coordinate(self):
         return self.__coordinate
 
+    def __update_max_coordinate(self):
+        size = self.get_size()
+        self.__maxCoordinate = [self.__coordinate[0] + size[0], self.__coordinate[1] + size[1], self.__coordinate[2] + size[2]]
+
+    def get_max_coordinate(self):
+        return self.__maxCoordinate
+
     def get_max_width(self):
-        return self.__coordinate[0] + self.__width
+        return self.__maxCoordinate[0]
 
     def get_max_thickness(self):
-        return self.__coordinate[1] + self.__thickness
+        return self.__maxCoordinate[1]
 
     def get_max_height(self):
-        return self.__coordinate[2] + self.__height
+        return self.__maxCoordinate[2]
+
+GRID_MAX_CELLS = 256 ** 3 # largest vehicle volume tracked by an OccupancyGrid, larger vehicles use an AABBTree
+
+class OccupancyGrid:
+    """
+    Bitmap of the occupied unit cells of a vehicle with integer dimensions.
+    Each height layer is one int whose bit x + y * width is set when cell (x, y) is occupied,
+    so a box is checked with one mask per layer it spans.
+    """
+    def __init__(self, w, t, h):
+        self.__width = w
+        self.__height = h
+        self.__footprints = {} # cache of unshifted (width, thickness) footprint masks
+        self.clear()
+
+    def clear(self):
+        self.__layers = [0] * self.__height
+
+    def __mask(self, box):
+        w = box[3] - box[0]
+        t = box[4] - box[1]
+        footprint = self.__footprints.get((w, t))
+        if footprint is None:
+            rowStride = 1 << self.__width
+            footprint = ((1 << w) - 1) * (((1 << (t * self.__width)) - 1) // (rowStride - 1)) # w bits repeated on t rows
+            self.__footprints[(w, t)] = footprint
+        return footprint << (box[0] + box[1] * self.__width)
+
+    def insert(self, box):
+        mask = self.__mask(box)
+        layers = self.__layers
+        for z in range(box[2], box[5]):
+            layers[z] |= mask
+
+    def collides(self, box):
+        """
+        Check whether any occupied cell lies inside the given box.
+        """
+        mask = self.__mask(box)
+        layers = self.__layers
+        for z in range(box[2], box[5]):
+            if layers[z] & mask:
+                return True
+        return False
+
+NULL_NODE = -1 # index of a missing node in the AABBTree node pool
+
+class AABBTree:
+    """
+    Dynamic bounding volume hierarchy over the boxes of packed packages.
+    Leaves are inserted next to the sibling that least increases the tree surface area
+    and the tree is kept balanced by rotations, so queries visit O(log n) nodes.
+    Nodes are indices into a pool of parallel lists (one list per field) rather than objects.
+    Each box is also kept as two SWAR keys packing its min and inclusive max corners into one int,
+    with lanes of lane_bits (value bits + a guard bit) per axis, so overlap tests cost a few integer ops.
+    """
+    def __init__(self, lane_bits=21):
+        self.__laneBits = lane_bits
+        self.__guard = (1 << (lane_bits - 1)) | (1 << (2 * lane_bits - 1)) | (1 << (3 * lane_bits - 1))
+        self.clear()
+
+    def clear(self):
+        self.__root = NULL_NODE
+        self.__box = []     # axis-aligned bounding box (x0, y0, z0, x1, y1, z1) of each node
+        self.__minKey = []  # SWAR key of (x0, y0, z0)
+        self.__maxKey = []  # SWAR key of (x1 - 1, y1 - 1, z1 - 1)
+        self.__parent = []
+        self.__left = []    # NULL_NODE for leaves
+        self.__right = []
+        self.__height = []  # leaves have height 0
+        self.__stack = []   # scratch traversal stack reused by every collision query
+
+    def __key(self, x, y, z):
+        return (((x << self.__laneBits) | y) << self.__laneBits) | z
+
+    def __set_box(self, node, box):
+        self.__box[node] = box
+        self.__minKey[node] = self.__key(box[0], box[1], box[2])
+        self.__maxKey[node] = self.__key(box[3] - 1, box[4] - 1, box[5] - 1)
+
+    def __allocate_node(self, box):
+        self.__box.append(box)
+        self.__minKey.append(self.__key(box[0], box[1], box[2]))
+        self.__maxKey.append(self.__key(box[3] - 1, box[4] - 1, box[5] - 1))
+        self.__parent.append(NULL_NODE)
+        self.__left.append(NULL_NODE)
+        self.__right.append(NULL_NODE)
+        self.__height.append(0)
+        return len(self.__box) - 1
+
+    def insert(self, box):
+        boxes = self.__box
+        parent = self.__parent
+        left = self.__left
+        right = self.__right
+        height = self.__height
+
+        leaf = self.__allocate_node(tuple(box))
+        if self.__root == NULL_NODE:
+            self.__root = leaf
+            return
+        leafBox = boxes[leaf]
+
+        # Sibling selection: descend while pushing the leaf down is cheaper than pairing it here
+        node = self.__root
+        while left[node] != NULL_NODE:
+            area = surface_area(boxes[node])
+            combinedArea = surface_area(union(boxes[node], leafBox))
+            cost = 2 * combinedArea                     # cost of creating a new parent for node and leaf
+            inheritanceCost = 2 * (combinedArea - area) # minimum cost of pushing the leaf further down
+            costLeft = self.__insertion_cost(left[node], leafBox) + inheritanceCost
+            costRight = self.__insertion_cost(right[node], leafBox) + inheritanceCost
+            if cost < costLeft and cost < costRight:
+                break
+            node = left[node] if costLeft < costRight else right[node]
+
+        # New parent joining the sibling and the leaf
+        sibling = node
+        oldParent = parent[sibling]
+        newParent = self.__allocate_node(union(boxes[sibling], leafBox))
+        parent[newParent] = oldParent
+        height[newParent] = height[sibling] + 1
+        left[newParent] = sibling
+        right[newParent] = leaf
+        parent[sibling] = newParent
+        parent[leaf] = newParent
+        if oldParent == NULL_NODE:
+            self.__root = newParent
+        elif left[oldParent] == sibling:
+            left[oldParent] = newParent
+        else:
+            right[oldParent] = newParent
+
+        # Walk back up refitting boxes and heights
+        node = parent[leaf]
+        while node != NULL_NODE:
+            node = self.__balance(node)
+            height[node] = 1 + max(height[left[node]], height[right[node]])
+            self.__set_box(node, union(boxes[left[node]], boxes[right[node]]))
+            node = parent[node]
+
+    def __insertion_cost(self, node, box):
+        """
+        Cost of descending into node when inserting box below it.
+        """
+        if self.__left[node] == NULL_NODE:
+            return surface_area(union(self.__box[node], box))
+        return surface_area(union(self.__box[node], box)) - surface_area(self.__box[node])
+
+    def __balance(self, a):
+        """
+        Rotate the higher grandchild of node a up if a is unbalanced; returns the node now in a's place.
+        """
+        if self.__left[a] == NULL_NODE or self.__height[a] < 2:
+            return a
+        b = self.__left[a]
+        c = self.__right[a]
+        balance = self.__height[c] - self.__height[b]
+        if balance > 1:
+            return self.__rotate(a, c, b, self.__right)
+        if balance < -1:
+            return self.__rotate(a, b, c, self.__left)
+        return a
+
+    def __rotate(self, a, up, other, side):
+        """
+        Promote child 'up' (stored in a's 'side' list) above a, keeping its higher child and handing the lower one to a.
+        """
+        boxes = self.__box
+        parent = self.__parent
+        left = self.__left
+        right = self.__right
+        height = self.__height
+        f = left[up]
+        g = right[up]
+
+        # Swap a and up
+        left[up] = a
+        parent[up] = parent[a]
+        parent[a] = up
+        if parent[up] == NULL_NODE:
+            self.__root = up
+        elif left[parent[up]] == a:
+            left[parent[up]] = up
+        else:
+            right[parent[up]] = up
+
+        # Keep the higher grandchild under up, the lower one goes to a
+        if height[f] > height[g]:
+            keep, give = f, g
+        else:
+            keep, give = g, f
+        right[up] = keep
+        side[a] = give
+        parent[give] = a
+        self.__set_box(a, union(boxes[other], boxes[give]))
+        self.__set_box(up, union(boxes[a], boxes[keep]))
+        height[a] = 1 + max(height[other], height[give])
+        height[up] = 1 + max(height[a], height[keep])
+        return up
+
+    def collides(self, box):
+        """
+        Check whether any packed box overlaps the given box (touching faces do not overlap).
+        """
+        return collides(self.__minKey, self.__maxKey, self.__left, self.__right, self.__root, self.__stack,
+                        self.__key(box[0], box[1], box[2]), self.__key(box[3] - 1, box[4] - 1, box[5] - 1), self.__guard)
+
+def collides(minKeys, maxKeys, left, right, root, stack, queryMinKey, queryMaxKey, guard):
+    """
+    Collision kernel of the AABBTree: iterative traversal of the node pool that returns on the first leaf overlapping the query.
+    Boxes overlap when min <= other inclusive max on every axis; with the guard bit set on the minuend,
+    a lane keeps its guard bit after the subtraction exactly when that holds, and lanes never borrow from each other.
+    """
+    if root == NULL_NODE:
+        return False
+    queryMaxKey |= guard
+    pop = stack.pop
+    push = stack.append
+    stack.clear() # may hold nodes left over from a previous early return
+    push(root)
+    while stack:
+        node = pop()
+        if (queryMaxKey - minKeys[node]) & ((maxKeys[node] | guard) - queryMinKey) & guard == guard:
+            if left[node] == NULL_NODE:
+                return True
+            push(left[node])
+            push(right[node])
+    return False
+
+def union(a, b):
+    """
+    Smallest box containing boxes a and b.
+    """
+    return (min(a[0], b[0]), min(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3]), max(a[4], b[4]), max(a[5], b[5]))
+
+def surface_area(box):
+    """
+    Surface area of a box, the cost metric of the AABBTree.
+    """
+    w = box[3] - box[0]
+    t = box[4] - box[1]
+    h = box[5] - box[2]
+    return 2 * (w * t + t * h + h * w)
 
 class Vehicle(Package):
     """
     Class representing a vehicle with specific platform and weight limits.
     Inherits from Package.
     """
+    __slots__ = ('__weightLimit', '__loadedWeight', '__packedVolume', '__packedCount', '__packagesInside', '__packagesOutside',
+                 '__freeBoxes', '__pivots', '__pivotKeys', '__platform', '__occupancy')
+
     def __init__(self, platform, name, w, t, h, weight):
         self._Package__name = name
         self._Package__height = h
         self._Package__width = w
         self._Package__thickness = t
         self._Package__volume  = w * h * t 
+        self._Package__sortedSize = tuple(sorted((w, t, h)))
+        self._Package__rotations = ((w, t, h), (w, h, t), (t, h, w), (t, w, h), (h, w, t), (h, t, w))
+        self._Package__uniqueRotations = tuple((rotation, size) for rotation, size in enumerate(self._Package__rotations)
+                                               if size not in self._Package__rotations[:rotation])
+        self._Package__currentRotation = 0
         self.__weightLimit = weight        
         self.__loadedWeight = 0
+        self.__packedVolume = 0
+        self.__packedCount = 0
         self.__packagesInside = []
         self.__packagesOutside = []
-        self.__occupiedPivots = []
+        self.__freeBoxes = {(0, 0, 0): (0, 0, 0, w, t, h)} # disjoint empty boxes (x0, y0, z0, x1, y1, z1) covering the free space, keyed by their pivot
+        self.__pivots = [(0, 0, 0)]                         # pivots of the free boxes in bottom-left-back order
+        self.__pivotKeys = [(0, 0, 0)]                      # pivot_order of each pivot, the sorted list searched by bisect
         self.__platform = platform
+        if w * t * h <= GRID_MAX_CELLS:
+            self.__occupancy = OccupancyGrid(w, t, h)                # occupied cells of the vehicle, used for collision checks
+        else:
+            self.__occupancy = AABBTree(max(w, t, h).bit_length() + 1) # bounding volume hierarchy of the packed packages, used for collision checks
 
     def get_platform(self):
         return self.__platform
@@ -118,17 +400,23 @@ class Vehicle(Package):
     def get_packed_packages(self):
         return self.__packagesInside
 
+    def get_packed_count(self):
+        return self.__packedCount
+
     def get_unpacked_packages(self):
         return self.__packagesOutside
 
-    def get_occupied_pivots(self):
-        return self.__occupiedPivots
+    def get_free_boxes(self):
+        return list(self.__freeBoxes.values())
 
-    def set_occupied_pivot(self, pivot):
-        self.__occupiedPivots.append(pivot)
+    def get_pivots(self):
+        return self.__pivots
 
     def add_packed_package(self, package):
         self.__packagesInside.append(package)
+        self.__packedVolume += package._Package__volume
+        self.__packedCount += 1
+        self.__occupancy.insert((*package._Package__coordinate, *package._Package__maxCoordinate))
 
     def add_unpacked_package(self, package):
         self.__packagesOutside.append(package)
@@ -146,153 +434,233 @@ class Vehicle(Package):
         return self.__weightLimit - self.__loadedWeight
 
     def get_packed_volume(self):
-        volume = 0
-        for package in self.__packagesInside:
-            volume += package.get_volume()
-        return volume
+        return self.__packedVolume
 
     def get_available_volume(self):
         return self._Package__volume - self.get_packed_volume()
 
     def clear(self):
         self.__loadedWeight = 0
+        self.__packedVolume = 0
+        self.__packedCount = 0
         self.__packagesInside = []
         self.__packagesOutside = []
+        self.__freeBoxes = {(0, 0, 0): (0, 0, 0, self._Package__width, self._Package__thickness, self._Package__height)}
+        self.__pivots = [(0, 0, 0)]
+        self.__pivotKeys = [(0, 0, 0)]
+        self.__occupancy.clear()
 
-    def pack(self, package, pivot):
+    def __carve(self, box, container=None):
+        """
+        Remove box from the free space: each free box it overlaps is replaced by its guillotine pieces around box.
+        container, when known, is the only free box that holds box.
+        """
+        freeBoxes = self.__freeBoxes
+        pivots = self.__pivots
+        pivotKeys = self.__pivotKeys
+        if container is not None:
+            overlapped = (container,)
+        else:
+            overlapped = [free for free in freeBoxes.values()
+                          if free[0] < box[3] and free[3] > box[0] and free[1] < box[4] and free[4] > box[1] and free[2] < box[5] and free[5] > box[2]]
+        pieces = {}
+        for free in overlapped:
+            del freeBoxes[free[:3]]
+            index = bisect_left(pivotKeys, pivot_order(free))
+            del pivots[index]
+            del pivotKeys[index]
+            pieces.update({piece[:3]: piece for piece in split_box(free, box)})
+        freeBoxes.update(pieces)
+        for pivot in pieces:
+            key = pivot_order(pivot)
+            index = bisect_left(pivotKeys, key)
+            pivotKeys.insert(index, key)
+            pivots.insert(index, pivot)
+
+    def pack(self, package, pivot, span=True):
         """
         Attempt to pack a package into the vehicle at the given pivot.
+        A rotation that fits inside the free box starting at the pivot needs no collision check;
+        otherwise, if span is set, the package may still span several free boxes if it collides with no packed package.
         """
-        for rotation in range(6):
-            packageSize = package.get_rotation(rotation)
-            if (self._Package__width - pivot[0]) < packageSize[0]:
-                continue
-            if (self._Package__thickness - pivot[1]) < packageSize[1]:
-                continue
-            if (self._Package__height - pivot[2]) < packageSize[2]:
+        px, py, pz = pivot = tuple(pivot)
+        container = self.__freeBoxes.get(pivot)
+        freeWidth = self._Package__width - px          # space left between the pivot and the vehicle walls,
+        freeThickness = self._Package__thickness - py  # it does not depend on the rotation tried
+        freeHeight = self._Package__height - pz
+        collides = self.__occupancy.collides
+        for rotation, (sw, st, sh) in package._Package__uniqueRotations:
+            box = (px, py, pz, px + sw, py + st, pz + sh)
+            if container is not None and box[3] <= container[3] and box[4] <= container[4] and box[5] <= container[5]:
+                self.__carve(box, container)                          # guillotine cut of the free box holding the package
+            elif not span or freeWidth < sw or freeThickness < st or freeHeight < sh or collides(box):
                 continue
-            collided = False
-            for packed in self.__packagesInside:
-                packedCoordinate = packed.get_coordinate()
-                if ((packedCoordinate[0] < (pivot[0] + packageSize[0]) and packed.get_max_width() > pivot[0]) and
-                    (packedCoordinate[1] < (pivot[1] + packageSize[1]) and packed.get_max_thickness() > pivot[1]) and
-                    (packedCoordinate[2] < (pivot[2] + packageSize[2]) and packed.get_max_height() > pivot[2])):
-                    collided = True
-                    break
-            if not collided:
-                package.set_rotation_type(rotation)          # success: change current package rotation
-                package.set_coordinate(pivot)                # success: position the package at the pivot (Bottom Rear Left)
-                self.set_occupied_pivot(pivot)               # success: position the package at the pivot
-                self.add_packed_package(package)             # success: insert package into vehicle's packed packages
-                self.add_loaded_weight(package.get_weight()) # success: add the package weight to the load
-                return True # if all checks are passed, the package is <= the available space
+            else:
+                self.__carve(box)                                     # the package spans free boxes: cut each of them
+            package._Package__currentRotation = rotation           # success: change current package rotation
+            package._Package__coordinate = pivot                   # success: position the package at the pivot (Bottom Rear Left)
+            package._Package__maxCoordinate = [px + sw, py + st, pz + sh] # success: opposite vertex (Top Front Right) of the package
+            self.add_packed_package(package)                       # success: insert package into vehicle's packed packages
+            self.__loadedWeight += package._Package__weight        # success: add the package weight to the load
+            return True # if all checks are passed, the package is <= the available space
         return False # if no rotation returns True, then no rotation fits the package
 
+def pivot_order(pivot):
+    """
+    Sort key of pivots: bottom first, then rear, then left.
+    """
+    return (pivot[2], pivot[1], pivot[0])
+
+def split_box(box, cut):
+    """
+    Guillotine decomposition of box minus the box cut (which must overlap it) into at most six disjoint pieces:
+    slabs beside cut along the width, then along the thickness, then along the height.
+    When cut sits at the pivot of box, only the [Bottom Rear Right], [Bottom Front Left] and [Top Rear Left] pieces remain.
+    """
+    x0, y0, z0, x1, y1, z1 = box
+    cx0, cy0, cz0 = max(x0, cut[0]), max(y0, cut[1]), max(z0, cut[2])
+    cx1, cy1, cz1 = min(x1, cut[3]), min(y1, cut[4]), min(z1, cut[5])
+    pieces = []
+    if cx0 > x0: pieces.append((x0, y0, z0, cx0, y1, z1))
+    if cx1 < x1: pieces.append((cx1, y0, z0, x1, y1, z1))      # [Bottom Rear Right]
+    if cy0 > y0: pieces.append((cx0, y0, z0, cx1, cy0, z1))
+    if cy1 < y1: pieces.append((cx0, cy1, z0, cx1, y1, z1))    # [Bottom Front Left]
+    if cz0 > z0: pieces.append((cx0, cy0, z0, cx1, cy1, cz0))
+    if cz1 < z1: pieces.append((cx0, cy0, cz1, cx1, cy1, z1))  # [Top Rear Left]
+    return pieces
+
 # Packer
 def packer(vehicle, packages):
     """
-    Attempt to pack all packages into the given vehicle.
+    Attempt to pack all packages into the given vehicle, in the given order.
     """
-    sorted_packages = sorted(packages, key=lambda p: (p.get_volume(), p.get_weight()), reverse=True)  # Sort packages by volume and weight
-    for package in sorted_packages:
+    vehicleSize = vehicle.get_sorted_size()
+
+    # Lightest weight and smallest volume among the packages from each index on
+    remainingMin = []
+    lightest = smallest = float('inf')
+    for package in reversed(packages):
+        lightest = min(lightest, package.get_weight())
+        smallest = min(smallest, package.get_volume())
+        remainingMin.append((lightest, smallest))
+    remainingMin.reverse()
+
+    failedSizes = [] # sorted sizes of the packages that found no place since the last package was packed
+
+    for index, package in enumerate(packages):
         packageFit = False
 
+        # The available weight and volume only decrease: once below every remaining package, none of them fits
+        if (vehicle.get_available_weight() < remainingMin[index][0]) or (vehicle.get_available_volume() < remainingMin[index][1]):
+            for remaining in packages[index:]:
+                vehicle.add_unpacked_package(remaining)
+            break
+
         if (vehicle.get_available_weight() < package.get_weight()) or (vehicle.get_available_volume() < package.get_volume()):
             vehicle.add_unpacked_package(package)
             continue
 
-        if len(vehicle.get_packed_packages()) == 0:
+        # Feasibility: a package fits the empty vehicle in some rotation iff its sorted dimensions do not exceed the vehicle's.
+        # Neither does it fit if it is at least as large on each sorted dimension as a package that found no place,
+        # as long as the pivots and free space have not changed since
+        packageSize = package.get_sorted_size()
+        if (packageSize[0] > vehicleSize[0] or packageSize[1] > vehicleSize[1] or packageSize[2] > vehicleSize[2] or
+            any(failed[0] <= packageSize[0] and failed[1] <= packageSize[1] and failed[2] <= packageSize[2] for failed in failedSizes)):
+            vehicle.add_unpacked_package(package)  # no pivot can hold it, skip trying them
+            continue
+
+        if vehicle.get_packed_count() == 0:
             packageFit = vehicle.pack(package, [0, 0, 0])
             if not packageFit:
                 vehicle.add_unpacked_package(package)  # if the package didn't fit in the empty vehicle,
                 continue                               # it is larger or heavier than the vehicle
         
         # Pivot Selection: vehicle loaded with at least one package
+        # Pivots are tried bottom-left-back first, first where the package fits their free box (no collision check),
+        # then where it spans several free boxes; any() stops at the first fit, after which the pivots have changed
         else:
-            pivots = get_pivots(vehicle)
-            for pivot in pivots:
-                if pivot in vehicle.get_occupied_pivots():
-                    continue
-                    
-                packageFit = vehicle.pack(package, pivot)  # if the package fits, its information is added to the vehicle
-                if packageFit:
-                    break # if the package was packed, there's no need to check other pivots
+            packageFit = (any(vehicle.pack(package, pivot, span=False) for pivot in vehicle.get_pivots()) or
+                          any(vehicle.pack(package, pivot) for pivot in vehicle.get_pivots()))
 
         # If no attempt fit the package, it remains outside
         if not packageFit:
             vehicle.add_unpacked_package(package)
+            failedSizes.append(packageSize)
+        else:
+            failedSizes.clear()
 
-def get_pivots(vehicle):
+# Classifier
+def classify_platform(vehicles, packages, distribute):
     """
-    Generate potential pivot points for placing new packages.
+    Pack the (sorted) packages into the vehicles of one platform, sorted by volume, distributing them among vehicles if requested.
+    Returns the % of load, the raw count and the packages carried by each vehicle.
     """
-    pivots = set()
-    for packed in vehicle.get_packed_packages():
-        packedCoordinate = packed.get_coordinate()
-        packedSize = packed.get_size()
-        pivots.add((packedCoordinate[0] + packedSize[0], packedCoordinate[1], packedCoordinate[2]))  # [Bottom Rear Right]
-        pivots.add((packedCoordinate[0], packedCoordinate[1] + packedSize[1], packedCoordinate[2]))  # [Bottom Front Left]
-        pivots.add((packedCoordinate[0], packedCoordinate[1], packedCoordinate[2] + packedSize[2]))  # [Top Rear Left]
-    return list(pivots)
+    packagePercentage = {}
+    packageCount = {}
+    packageNames = {}
+
+    unpackedPackages = packages
+    packageTotal = len(packages)
+
+    for vehicle in vehicles:
+        packer(vehicle, unpackedPackages)
+        packedCount = vehicle.get_packed_count()
+        packagePercentage[vehicle.get_name()] = (packedCount / packageTotal)       # Store the % of load carried for each vehicle
+        packageCount[vehicle.get_name()] = packedCount                             # Store the raw count of load carried for each vehicle
+        packageNames[vehicle.get_name()] = (vehicle.get_packed_packages())         # Store the packages loaded in each vehicle
+
+        if packedCount == packageTotal:  # Early termination if all packages are packed
+            break
+        if distribute:  # Only unpacked packages will be sent, still sorted since packer keeps their order
+            unpackedPackages = vehicle.get_unpacked_packages()
+        if distribute and len(unpackedPackages) == 0:  # End the loop if there are no more packages to load
+            break
+
+    return packagePercentage, packageCount, packageNames
 
-# Classifier
 def classifier(platforms, packages):
     """
     Classify the best vehicle or combination of vehicles to pack the packages.
+    Platforms are independent, so they are packed in parallel processes when there are several.
     """
     if not args.d:
         print("Smallest vehicle that accommodates the maximum load:")
     else:
         print("Best combination of vehicles that accommodates the maximum load:")
     
-    for platform in platforms.keys():
-        packagePercentage = {}
-        packageCount = {}
-        packageNames = {}
-
-        vehicles = platforms.get(platform)
-        vehicles.sort(key=lambda vehicle: vehicle.get_volume())  # Sort vehicles by volume
-        unpackedPackages = packages
-
-        for vehicle in vehicles:
-            packer(vehicle, unpackedPackages)
-            packagePercentage[vehicle.get_name()] = (len(vehicle.get_packed_packages()) / len(packages))  # Store the % of load carried for each vehicle
-            packageCount[vehicle.get_name()] = (len(vehicle.get_packed_packages()))                       # Store the raw count of load carried for each vehicle
-            packageNames[vehicle.get_name()] = (vehicle.get_packed_packages())                            # Store the packages loaded in each vehicle
-            
-            if len(vehicle.get_packed_packages()) == len(packages):  # Early termination if all packages are packed
-                break
-            if args.d:  # Only unpacked packages will be sent
-                unpackedPackages = vehicle.get_unpacked_packages()
-            if args.d and len(unpackedPackages) == 0:  # End the loop if there are no more packages to load
-                break
-        
+    sorted_packages = sorted(packages, key=lambda p: (p.get_volume(), p.get_weight()), reverse=True)  # Sort packages by volume and weight
+
+    if len(platforms) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(platforms), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(classify_platform, platforms.values(), repeat(sorted_packages), repeat(args.d)))
+    else:
+        results = [classify_platform(vehicles, sorted_packages, args.d) for vehicles in platforms.values()]
+
+    for platform, (packagePercentage, packageCount, packageNames) in zip(platforms.keys(), results):
         # Output
         if not args.d:
             bestOption = max(packagePercentage, key=packagePercentage.get)
             print(f"{platform} | {bestOption} | Packages accommodated: {(packagePercentage[bestOption]*100)}%")
             if args.l:
-                with open(f"best_individual_vehicle_{platform}.txt", "w") as packageList:
-                    packageList.write(f"{platform} = {bestOption}\n")
-                    for package in packageNames[bestOption]:
-                        packageList.write(f"{package.get_name()}\n")
+                packageList = [f"{platform} = {bestOption}\n"]
+                packageList.extend(f"{package.get_name()}\n" for package in packageNames[bestOption])
+                with open(f"best_individual_vehicle_{platform}.txt", "w") as packageFile:
+                    packageFile.write("".join(packageList))
         else:
             print(f"{platform}: {sum(packageCount.values())} packages occupied")
             if args.l:
-                with open(f"best_combination_{platform}.txt", "w") as packageList:
-                    packageList.write(f"{platform}:\n")
+                packageList = [f"{platform}:\n"]
                 for vehicle in packageCount:
                     print(f"{vehicle} | Packages Occupied: {(packageCount[vehicle])}")
-                    if args.l:
-                        with open(f"best_combination_{platform}.txt", "a") as packageList:
-                            packageList.write(f"{vehicle}\n")
-                            for package in packageNames[vehicle]:
-                                packageList.write(f"{package.get_name()}\n")
+                    packageList.append(f"{vehicle}\n")
+                    packageList.extend(f"{package.get_name()}\n" for package in packageNames[vehicle])
+                with open(f"best_combination_{platform}.txt", "w") as packageFile:
+                    packageFile.write("".join(packageList))
 
 # Input
 def read_vehicles(file_path):
     """
-    Read vehicles from the CSV file.
+    Read vehicles from the CSV file, grouped by platform and sorted by volume.
     """
     platforms = defaultdict(list)
     with open(file_path, 'rt') as f:
@@ -300,6 +668,8 @@ def read_vehicles(file_path):
         next(csv_vehicles)
         for row in csv_vehicles:
             platforms[row[0]].append(Vehicle(row[0], row[1], int(row[2]), int(row[3]), int(row[4]), int(row[5])))
+    for vehicles in platforms.values():
+        vehicles.sort(key=lambda vehicle: vehicle._Package__volume)  # Sort vehicles by volume once, at ingest
     return platforms
 
 def read_packages(file_path):
@@ -322,7 +692,7 @@ if __name__ == "__main__":
     if args.v:
         platforms = read_vehicles(args.v)
     else:
-        platforms = {
+        platforms = {  # sorted by volume, as read_vehicles returns them
             'Platform1': [Vehicle('Platform1', 'Vehicle1', 10, 10, 10, 50),
                           Vehicle('Platform1', 'Vehicle2', 15, 15, 15, 75)]
         }
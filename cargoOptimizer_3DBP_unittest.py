@@ -1,5 +1,6 @@
 import unittest
-from cargoOptimizer_3DBP import Package, Vehicle, packer
+from unittest import mock
+from cargoOptimizer_3DBP import Package, Vehicle, packer, classify_platform
 
 class Test3DBinPacking(unittest.TestCase):
 
@@ -15,15 +16,41 @@ class Test3DBinPacking(unittest.TestCase):
         self.assertEqual(self.package2.get_volume(), 27)
         self.assertEqual(self.package3.get_volume(), 1)
 
+    def test_unique_rotations(self):
+        self.assertEqual(len(self.package1.get_unique_rotations()), 1)
+        self.assertEqual(len(Package("Package4", 2, 2, 3, 1).get_unique_rotations()), 3)
+        self.assertEqual(len(Package("Package5", 1, 2, 3, 1).get_unique_rotations()), 6)
+        self.assertEqual(Package("Package6", 2, 3, 3, 1).get_unique_rotations(), ((0, (2, 3, 3)), (2, (3, 3, 2)), (3, (3, 2, 3))))
+
     def test_vehicle_capacity(self):
         self.assertEqual(self.vehicle.get_volume(), 125)
         self.assertEqual(self.vehicle.get_weight_limit(), 10)
+        self.assertEqual(self.vehicle.get_rotation(0), (5, 5, 5))
+
+    def test_packed_volume(self):
+        packer(self.vehicle, [self.package1, self.package3])
+        self.assertEqual(self.vehicle.get_packed_volume(), 9)
+        self.assertEqual(self.vehicle.get_available_volume(), 116)
+        self.vehicle.clear()
+        self.assertEqual(self.vehicle.get_packed_volume(), 0)
 
     def test_packing_single_package(self):
         packed = self.vehicle.pack(self.package1, [0, 0, 0])
         self.assertTrue(packed)
         self.assertIn(self.package1, self.vehicle.get_packed_packages())
 
+    def test_pivots_after_packing(self):
+        self.assertEqual(self.vehicle.get_pivots(), [(0, 0, 0)])
+        self.vehicle.pack(self.package1, [0, 0, 0])
+        self.assertEqual(self.vehicle.get_pivots(), [(2, 0, 0), (0, 2, 0), (0, 0, 2)])  # bottom-left-back order
+
+    def test_free_boxes_after_packing(self):
+        self.assertEqual(self.vehicle.get_free_boxes(), [(0, 0, 0, 5, 5, 5)])
+        self.vehicle.pack(self.package1, [0, 0, 0])
+        self.assertCountEqual(self.vehicle.get_free_boxes(), [(2, 0, 0, 5, 5, 5), (0, 2, 0, 2, 5, 5), (0, 0, 2, 2, 2, 5)])
+        self.vehicle.pack(self.package3, [1, 3, 0])  # spans no pivot: the free box around it is cut into pieces
+        self.assertEqual(sum((b[3] - b[0]) * (b[4] - b[1]) * (b[5] - b[2]) for b in self.vehicle.get_free_boxes()), 116)
+
     def test_packing_multiple_packages(self):
         packer(self.vehicle, [self.package1, self.package2, self.package3])
         packed_packages = self.vehicle.get_packed_packages()
@@ -31,6 +58,7 @@ class Test3DBinPacking(unittest.TestCase):
         self.assertIn(self.package3, packed_packages)
         self.assertIn(self.package2, packed_packages)
         self.assertEqual(len(packed_packages), 3)
+        self.assertEqual(self.vehicle.get_packed_count(), 3)
 
     def test_unpacked_packages_due_to_weight(self):
         heavy_package = Package("HeavyPackage", 1, 1, 1, 11)
@@ -59,6 +87,52 @@ class Test3DBinPacking(unittest.TestCase):
         self.assertEqual(len(vehicle.get_unpacked_packages()), 1)
         self.assertEqual(vehicle.get_unpacked_packages()[0].get_name(), "HeavyPackage")
 
+    def test_packages_left_after_vehicle_is_full(self):
+        vehicle = Vehicle("Platform1", "Vehicle1", 4, 4, 4, 3)
+        packages = [Package(f"Package{i}", 2, 2, 2, 1) for i in range(10)]
+        packer(vehicle, packages)
+        self.assertEqual(len(vehicle.get_packed_packages()), 3)     # weight limit reached
+        self.assertEqual(vehicle.get_unpacked_packages(), packages[3:])
+
+        vehicle = Vehicle("Platform1", "Vehicle1", 4, 4, 4, 100)
+        packer(vehicle, packages)
+        self.assertEqual(len(vehicle.get_packed_packages()), 8)     # space exhausted
+        self.assertEqual(vehicle.get_unpacked_packages(), packages[8:])
+
+    def test_classify_platform(self):
+        packages = [Package(f"Package{i}", 2, 2, 2, 1) for i in range(20)]
+        vehicles = [Vehicle("Platform1", "Vehicle1", 4, 4, 4, 100),
+                    Vehicle("Platform1", "Vehicle2", 6, 6, 6, 100),
+                    Vehicle("Platform1", "Vehicle3", 10, 10, 10, 100)]
+        percentage, count, names = classify_platform(vehicles, packages, False)
+        self.assertEqual(percentage, {"Vehicle1": 0.4, "Vehicle2": 1.0})  # Vehicle3 is not tried, Vehicle2 takes them all
+        self.assertEqual(count, {"Vehicle1": 8, "Vehicle2": 20})
+        self.assertEqual(names["Vehicle2"], packages)
+
+        vehicles = [Vehicle("Platform1", "Vehicle1", 4, 4, 4, 100),
+                    Vehicle("Platform1", "Vehicle2", 6, 6, 6, 100),
+                    Vehicle("Platform1", "Vehicle3", 10, 10, 10, 100)]
+        percentage, count, names = classify_platform(vehicles, packages, True)
+        self.assertEqual(percentage, {"Vehicle1": 0.4, "Vehicle2": 0.6})  # Vehicle3 is not needed
+        self.assertEqual(count, {"Vehicle1": 8, "Vehicle2": 12})
+        self.assertEqual(names["Vehicle1"], packages[:8])
+        self.assertEqual(names["Vehicle2"], packages[8:])  # handed over in their original order
+
+    def test_packages_as_large_as_a_failed_one(self):
+        vehicle = Vehicle("Platform1", "Vehicle1", 4, 4, 4, 100)
+        base = Package("Base", 4, 4, 3, 1)         # leaves a 4x4x1 slab on top
+        failed = Package("Failed", 2, 2, 2, 1)     # finds no pivot
+        larger = Package("Larger", 2, 3, 2, 1)     # as large on every sorted side: skipped without trying pivots
+        smaller = Package("Smaller", 1, 2, 2, 1)   # still fits the slab, and clears the failed sizes
+        retried = Package("Retried", 2, 2, 2, 1)   # as large as failed, but tried again after the placement
+        with mock.patch.object(Vehicle, "pack", autospec=True, side_effect=Vehicle.pack) as pack:
+            packer(vehicle, [base, failed, larger, smaller, retried])
+        tried = {args[1] for args, kwargs in pack.call_args_list}
+        self.assertEqual(vehicle.get_packed_packages(), [base, smaller])
+        self.assertEqual(vehicle.get_unpacked_packages(), [failed, larger, retried])
+        self.assertNotIn(larger, tried)
+        self.assertIn(retried, tried)
+
     def test_exact_fit_packages(self):
         vehicle = Vehicle("Platform1", "Vehicle1", 6, 6, 6, 50)
         packages = [
@@ -96,6 +170,28 @@ class Test3DBinPacking(unittest.TestCase):
         self.assertIn(package3, vehicle.get_packed_packages())
         self.assertNotIn(package2, vehicle.get_packed_packages())
 
+    def test_overlapping_packages_in_large_vehicle(self):
+        vehicle = Vehicle("Platform1", "Vehicle1", 1000, 1000, 1000, 50)  # too large for an occupancy grid
+        package1 = Package("Package1", 300, 300, 300, 5)
+        package2 = Package("Package2", 300, 300, 300, 5)
+        package3 = Package("Package3", 300, 300, 300, 5)
+
+        self.assertTrue(vehicle.pack(package1, [0, 0, 0]))
+        self.assertFalse(vehicle.pack(package2, [100, 100, 100]))  # This should fail due to overlap
+        self.assertTrue(vehicle.pack(package3, [300, 0, 0]))       # This should succeed, touching package1
+
+        self.assertIn(package1, vehicle.get_packed_packages())
+        self.assertIn(package3, vehicle.get_packed_packages())
+        self.assertNotIn(package2, vehicle.get_packed_packages())
+
+    def test_long_package_cannot_fit(self):
+        vehicle = Vehicle("Platform1", "Vehicle1", 10, 10, 10, 100)
+        vehicle.pack(Package("Package1", 1, 1, 1, 1), [0, 0, 0])
+        long_package = Package("LongPackage", 1, 11, 1, 1)  # small volume, but longer than every side of the vehicle
+        packer(vehicle, [long_package])
+        self.assertIn(long_package, vehicle.get_unpacked_packages())
+        self.assertEqual(len(vehicle.get_packed_packages()), 1)
+
     def test_large_package_cannot_fit(self):
         vehicle = Vehicle("Platform1", "Vehicle1", 10, 10, 10, 100)
         large_package = Package("LargePackage", 15, 15, 15, 10)